@@ -5,16 +5,101 @@ Downloads images and videos from Civitai.com using their official API
 Filters for content with 200+ user reactions (likes/hearts)
 """
 
-import requests
+import httpx
 import json
 import time
 import os
+import re
+import pickle
 import argparse
+import asyncio
+import aiohttp
+import aiofiles
+from aiolimiter import AsyncLimiter
 from pathlib import Path
 from typing import Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from operator import itemgetter
+from functools import lru_cache
 from datetime import datetime
 import mimetypes
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Build the MIME type map once at import instead of lazily on first guess,
+# and memoize lookups since CDN URLs repeat a handful of extensions
+mimetypes.init()
+_guess_type = lru_cache(maxsize=1024)(mimetypes.guess_type)
+
+# Extensions that mark a URL as video (lowercase, with leading dot)
+VIDEO_EXTENSIONS = frozenset({'.mp4', '.webm', '.mov', '.avi', '.mkv'})
+
+# Compiled once so URL suffix detection needs no per-call lowercase copy
+_VIDEO_URL_RE = re.compile(
+    r'(?:' + '|'.join(re.escape(ext) for ext in sorted(VIDEO_EXTENSIONS)) + r')$',
+    re.IGNORECASE
+)
+
+# Reaction counters summed into an item's vote total
+REACTION_KEYS = ("likeCount", "heartCount", "laughCount", "cryCount")
+_REACTION_DEFAULTS = (0,) * len(REACTION_KEYS)
+
+# C-level multi-key getters; callers fall back to dict.get on KeyError
+_get_reactions = itemgetter(*REACTION_KEYS)
+_get_id_url = itemgetter("id", "url")
+
+
+def normalize_id(item_id):
+    """
+    Normalize an item ID for set membership tests
+
+    Civitai IDs are integers; storing them as ints rather than their
+    string forms roughly halves the set's memory and speeds up hashing.
+    Non-numeric IDs fall back to their string form.
+    """
+    try:
+        return int(item_id)
+    except (TypeError, ValueError):
+        return str(item_id)
+
+
+def make_reaction_filter(min_reactions: int):
+    """
+    Build a predicate specialized for one reaction threshold
+
+    The threshold, key tuple and builtins are bound as defaults so the
+    per-item hot loop does no global or attribute lookups.
+    """
+    def passes(item, _min=min_reactions, _sum=sum, _map=map, _get=_get_reactions,
+               _keys=REACTION_KEYS, _defaults=_REACTION_DEFAULTS):
+        stats = item.get("stats")
+        if not stats:
+            return _min <= 0
+        try:
+            # Fast path: all four counters present, one C-level lookup
+            return _sum(_get(stats)) >= _min
+        except KeyError:
+            return _sum(_map(stats.get, _keys, _defaults)) >= _min
+    return passes
+
+
+def dump_json_bytes(data) -> bytes:
+    """Serialize to pretty-printed JSON bytes, using orjson when available"""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, indent=2).encode('utf-8')
+
+
+def dump_json_line(data) -> str:
+    """Serialize to one compact JSON line, using orjson when available"""
+    if orjson is not None:
+        return orjson.dumps(data).decode('utf-8')
+    return json.dumps(data, separators=(',', ':'))
+
+
 class CivitaiScraper:
     """Scraper for downloading images and videos from Civitai API"""
     
@@ -34,16 +119,23 @@ class CivitaiScraper:
         """
         self.base_url = "https://civitai.com/api/v1"
         self.api_key = api_key
-        self.session = requests.Session()
-        
+
         # Set up headers
         self.headers = {
             "Content-Type": "application/json",
             "User-Agent": "CivitaiScraper/1.0"
         }
-        
+
         if self.api_key:
             self.headers["Authorization"] = f"Bearer {self.api_key}"
+
+        # Pooled HTTP/2 client so API requests share one TCP/TLS connection
+        self.session = httpx.Client(
+            http2=True,
+            headers=self.headers,
+            timeout=30.0,
+            limits=httpx.Limits(max_connections=64, max_keepalive_connections=32)
+        )
         
         # Store configuration
         self.config = {
@@ -74,8 +166,22 @@ class CivitaiScraper:
         # Config file path
         self.config_file = Path(f"{config_name}.json")
         
-        # Track downloads
+        # Download concurrency and rate limit (requests per second)
+        self.download_concurrency = 32
+        self.download_rate = 10
+        self.limiter = None  # Created inside the event loop in _download_all
+
+        # Track downloads: a pickled set snapshot plus an append-only JSONL
+        # log of ids downloaded since the snapshot
+        self.ids_file = self.metadata_dir / f"{self.config_name}_downloaded_ids.jsonl"
+        self.ids_snapshot_file = self.metadata_dir / f"{self.config_name}_downloaded_ids.pkl"
         self.downloaded_ids = self._load_downloaded_ids()
+        self._unsaved_ids = []
+
+        # Per-item metadata is batched into one JSONL shard per config
+        # instead of thousands of small files
+        self.metadata_shard_file = self.metadata_dir / f"{self.config_name}_metadata.jsonl"
+        self._unsaved_metadata = []
         self.stats = {
             "images_downloaded": 0,
             "videos_downloaded": 0,
@@ -86,17 +192,57 @@ class CivitaiScraper:
     
     def _load_downloaded_ids(self) -> set:
         """Load previously downloaded IDs to avoid duplicates"""
-        ids_file = self.metadata_dir / f"{self.config_name}_downloaded_ids.json"
-        if ids_file.exists():
-            with open(ids_file, 'r') as f:
-                return set(json.load(f))
+        ids = set()
+
+        # Binary snapshot from the last completed run
+        if self.ids_snapshot_file.exists():
+            with open(self.ids_snapshot_file, 'rb') as f:
+                ids = set(map(normalize_id, pickle.load(f)))
+
+        # Replay ids appended after the snapshot (interrupted run)
+        if self.ids_file.exists():
+            with open(self.ids_file, 'r') as f:
+                ids.update(normalize_id(line.strip()) for line in f if line.strip())
+
+        if ids:
+            return ids
+
+        # Fall back to the legacy full-rewrite JSON format
+        legacy_file = self.metadata_dir / f"{self.config_name}_downloaded_ids.json"
+        if legacy_file.exists():
+            with open(legacy_file, 'r') as f:
+                return set(map(normalize_id, json.load(f)))
         return set()
-    
+
+    def _record_downloaded_id(self, item_id):
+        """Track a newly downloaded ID for the next incremental save"""
+        item_id = normalize_id(item_id)
+        self.downloaded_ids.add(item_id)
+        self._unsaved_ids.append(str(item_id))
+
     def _save_downloaded_ids(self):
-        """Save downloaded IDs to file"""
-        ids_file = self.metadata_dir / f"{self.config_name}_downloaded_ids.json"
-        with open(ids_file, 'w') as f:
-            json.dump(list(self.downloaded_ids), f)
+        """Append IDs downloaded since the last save to the JSONL log"""
+        if not self._unsaved_ids:
+            return
+        with open(self.ids_file, 'a') as f:
+            f.write('\n'.join(self._unsaved_ids) + '\n')
+        self._unsaved_ids = []
+
+    def _save_metadata_shard(self):
+        """Append metadata lines collected since the last save to the shard"""
+        if not self._unsaved_metadata:
+            return
+        with open(self.metadata_shard_file, 'a', encoding='utf-8') as f:
+            f.write('\n'.join(self._unsaved_metadata) + '\n')
+        self._unsaved_metadata = []
+
+    def _save_id_snapshot(self):
+        """Compact the ID set into a binary snapshot and clear the log"""
+        self._save_downloaded_ids()
+        with open(self.ids_snapshot_file, 'wb') as f:
+            pickle.dump(self.downloaded_ids, f, protocol=pickle.HIGHEST_PROTOCOL)
+        if self.ids_file.exists():
+            self.ids_file.unlink()
     
     def _save_config(self):
         """Save configuration and stats to JSON file"""
@@ -109,116 +255,143 @@ class CivitaiScraper:
                 "videos": str(self.video_dir),
                 "metadata": str(self.metadata_dir)
             },
-            "downloaded_ids_file": str(self.metadata_dir / f"{self.config_name}_downloaded_ids.json")
+            "downloaded_ids_file": str(self.ids_snapshot_file)
         }
         
-        with open(self.config_file, 'w') as f:
-            json.dump(config_data, f, indent=2)
+        with open(self.config_file, 'wb') as f:
+            f.write(dump_json_bytes(config_data))
         
         print(f"\n✓ Configuration saved to: {self.config_file}")
     
     def fetch_images(self, limit_per_request: int = 200, max_requests: int = 100) -> List[Dict]:
         """
         Fetch images from Civitai API with minimum reaction count
-        
+
         Args:
             limit_per_request: Number of items per API request (max 200)
             max_requests: Maximum number of API requests to make (prevents infinite loops)
-        
+
         Returns:
             List of image/video metadata dictionaries
         """
-        min_reactions = self.config["min_votes"]
         all_items = []
-        next_cursor = None
+        for page_items in self.iter_pages(limit_per_request, max_requests):
+            all_items.extend(page_items)
+        return all_items
+
+    def iter_pages(self, limit_per_request: int = 200, max_requests: int = 100):
+        """
+        Yield filtered API pages one at a time as they arrive
+
+        Streaming pages lets the download stage start on the first page
+        while later pages are still being fetched.
+
+        Args:
+            limit_per_request: Number of items per API request (max 200)
+            max_requests: Maximum number of API requests to make (prevents infinite loops)
+
+        Yields:
+            Lists of qualifying item dictionaries, one list per API page
+        """
+        min_reactions = self.config["min_votes"]
+        passes_filter = make_reaction_filter(min_reactions)
+        total_collected = 0
         request_count = 0
         consecutive_low_votes = 0
-        
+
         print(f"Fetching items with {min_reactions}+ reactions...")
         print(f"Note: Will fetch up to {max_requests} pages to find enough content\n")
-        
-        while request_count < max_requests:
-            # Build URL with parameters
+
+        def build_params(cursor=None):
             params = {
                 "limit": limit_per_request,
                 "sort": "Most Reactions",  # Sort by reactions to get highly-voted content first
                 "period": "AllTime"
             }
-            
-            if next_cursor:
-                params["cursor"] = next_cursor
-            
-            try:
-                # Make API request
-                url = f"{self.base_url}/images"
-                response = self.session.get(
-                    url,
-                    headers=self.headers,
-                    params=params,
-                    timeout=30
-                )
-                
-                response.raise_for_status()
-                data = response.json()
-                
+            if cursor:
+                params["cursor"] = cursor
+            return params
+
+        # Fetch the next page on a worker thread so the network wait overlaps
+        # with filtering the page we already have
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            future = executor.submit(self._fetch_page, build_params())
+
+            while request_count < max_requests:
+                try:
+                    data = future.result()
+                except (httpx.HTTPError, ValueError) as e:
+                    # ValueError covers JSONDecodeError from a malformed
+                    # 200 body, which response.json() raises directly
+                    print(f"Error fetching data: {e}")
+                    self.stats["errors"] += 1
+                    # Wait longer on error
+                    time.sleep(5)
+                    break
+
                 items = data.get("items", [])
                 metadata = data.get("metadata", {})
-                
+
                 request_count += 1
-                items_meeting_criteria = 0
-                
-                # Filter items by reaction count
-                for item in items:
-                    stats = item.get("stats", {})
-                    total_reactions = (
-                        stats.get("likeCount", 0) + 
-                        stats.get("heartCount", 0) +
-                        stats.get("laughCount", 0) +
-                        stats.get("cryCount", 0)
-                    )
-                    
-                    if total_reactions >= min_reactions:
-                        all_items.append(item)
-                        items_meeting_criteria += 1
-                
+
+                # Kick off the next request before filtering this page
+                next_cursor = metadata.get("nextCursor")
+                next_page = metadata.get("nextPage")
+                future = None
+                if (next_cursor or next_page) and request_count < max_requests:
+                    future = executor.submit(self._fetch_page, build_params(next_cursor), delay=1)
+
+                # Filter items by reaction count with the specialized predicate
+                page_items = [item for item in items if passes_filter(item)]
+                items_meeting_criteria = len(page_items)
+                total_collected += items_meeting_criteria
+
                 # Track if we're getting low-quality content
                 if items_meeting_criteria < len(items) * 0.1:  # Less than 10% meet criteria
                     consecutive_low_votes += 1
                 else:
                     consecutive_low_votes = 0
-                
+
                 print(f"Request {request_count}/{max_requests}: Fetched {len(items)} items, "
                       f"{items_meeting_criteria} meet criteria (≥{min_reactions} votes), "
-                      f"Total collected: {len(all_items)}")
-                
+                      f"Total collected: {total_collected}")
+
+                if page_items:
+                    yield page_items
+
                 # Stop if we've had 5 consecutive pages with very few qualifying items
                 # This prevents wasting time on low-quality content
                 if consecutive_low_votes >= 5:
                     print(f"\n⚠ Stopping: Found very few items meeting criteria in last {consecutive_low_votes} pages")
                     print(f"Consider lowering --min-votes to find more content")
+                    if future is not None:
+                        future.cancel()
                     break
-                
-                # Check for next page
-                next_cursor = metadata.get("nextCursor")
-                next_page = metadata.get("nextPage")
-                
-                if not next_cursor and not next_page:
+
+                if future is None:
                     print("\nℹ No more pages available from API")
                     break
-                
-                # Rate limiting - be nice to the API
-                time.sleep(1)
-                
-            except requests.exceptions.RequestException as e:
-                print(f"Error fetching data: {e}")
-                self.stats["errors"] += 1
-                # Wait longer on error
-                time.sleep(5)
-                break
-        
-        print(f"\nTotal items fetched: {len(all_items)}")
+
+        print(f"\nTotal items fetched: {total_collected}")
         print(f"API requests made: {request_count}/{max_requests}")
-        return all_items
+
+    def _fetch_page(self, params: Dict, delay: float = 0) -> Dict:
+        """
+        Fetch one API page (runs on the prefetch worker thread)
+
+        Args:
+            params: Query parameters for the /images endpoint
+            delay: Seconds to wait before requesting (API politeness)
+
+        Returns:
+            Decoded JSON response
+        """
+        if delay:
+            # Rate limiting - be nice to the API
+            time.sleep(delay)
+        response = self.session.get(f"{self.base_url}/images", params=params)
+        response.raise_for_status()
+        return response.json()
     
     def _is_video(self, url: str, item: Dict) -> bool:
         """
@@ -231,10 +404,8 @@ class CivitaiScraper:
         Returns:
             True if video, False if image
         """
-        # Check URL extension
-        url_lower = url.lower()
-        video_extensions = ['.mp4', '.webm', '.mov', '.avi', '.mkv']
-        if any(url_lower.endswith(ext) for ext in video_extensions):
+        # Check URL extension with one pre-compiled regex pass
+        if _VIDEO_URL_RE.search(url):
             return True
         
         # Check metadata for video indicators
@@ -244,37 +415,43 @@ class CivitaiScraper:
                 return True
         
         # Check MIME type if available
-        mime_type, _ = mimetypes.guess_type(url)
+        mime_type, _ = _guess_type(url)
         if mime_type and mime_type.startswith('video/'):
             return True
         
         return False
     
-    def download_media(self, item: Dict) -> Optional[str]:
+    async def download_media(self, session: aiohttp.ClientSession, item: Dict) -> Optional[str]:
         """
         Download a single media file (image or video)
-        
+
         Args:
+            session: Shared aiohttp session (reused for connection pooling)
             item: Item metadata from API
-        
+
         Returns:
             Path to downloaded file, or None if failed
         """
-        item_id = item.get("id")
-        url = item.get("url")
-        
+        try:
+            item_id, url = _get_id_url(item)
+        except KeyError:
+            item_id = item.get("id")
+            url = item.get("url")
+
         if not url or not item_id:
             print(f"⚠ Skipping item {item_id or 'unknown'}: missing URL or ID")
             return None
-        
+
         # Skip if already downloaded
-        if str(item_id) in self.downloaded_ids:
+        if normalize_id(item_id) in self.downloaded_ids:
             return None
-        
+
         try:
-            # Determine if video or image
-            is_video = self._is_video(url, item)
-            
+            # Determine if video or image (cached on the item by the pipeline worker)
+            is_video = item.get("_is_video")
+            if is_video is None:
+                is_video = self._is_video(url, item)
+
             # Set directory and update stats
             if is_video:
                 media_dir = self.video_dir
@@ -282,50 +459,50 @@ class CivitaiScraper:
             else:
                 media_dir = self.image_dir
                 media_type = "image"
-            
-            # Extract file extension from URL
-            ext = Path(url).suffix
-            if not ext or ext == '':
+
+            # Extract file extension from URL (splitext avoids building a
+            # Path object per download)
+            ext = os.path.splitext(url)[1]
+            if not ext:
                 ext = ".jpeg" if not is_video else ".mp4"
-            
+
             # Create filename with Civitai ID
             filename = f"civitai_{item_id}{ext}"
             filepath = media_dir / filename
-            
-            # Download file
+
+            # Download file (token bucket replaces the old per-item sleep)
             print(f"Downloading {media_type} {item_id}...")
-            response = self.session.get(url, timeout=60, stream=True)
-            response.raise_for_status()
-            
-            # Save file
-            with open(filepath, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    f.write(chunk)
-            
-            # Save metadata (handle None values gracefully)
-            metadata_file = self.metadata_dir / f"civitai_{item_id}.json"
+            async with self.limiter:
+                async with session.get(url) as response:
+                    response.raise_for_status()
+
+                    # Save file
+                    async with aiofiles.open(filepath, 'wb') as f:
+                        async for chunk in response.content.iter_chunked(65536):
+                            await f.write(chunk)
+
+            # Save metadata (handle None values gracefully) into the shared
+            # JSONL shard; lines are buffered and flushed between batches
             try:
-                with open(metadata_file, 'w') as f:
-                    json.dump(item, f, indent=2)
+                # Drop internal cache keys (e.g. _is_video) from the saved metadata
+                self._unsaved_metadata.append(
+                    dump_json_line({k: v for k, v in item.items() if not k.startswith('_')}))
             except (TypeError, ValueError) as e:
                 print(f"⚠ Warning: Could not save metadata for {item_id}: {e}")
-            
+
             # Update tracking
-            self.downloaded_ids.add(str(item_id))
-            
+            self._record_downloaded_id(item_id)
+
             if is_video:
                 self.stats["videos_downloaded"] += 1
             else:
                 self.stats["images_downloaded"] += 1
-            
+
             print(f"✓ Downloaded {media_type}: {filename}")
-            
-            # Rate limiting
-            time.sleep(0.5)
-            
+
             return str(filepath)
-            
-        except requests.exceptions.RequestException as e:
+
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
             print(f"✗ Error downloading {item_id}: {e}")
             self.stats["errors"] += 1
             return None
@@ -333,6 +510,111 @@ class CivitaiScraper:
             print(f"✗ Unexpected error with {item_id}: {e}")
             self.stats["errors"] += 1
             return None
+
+    async def _run_pipeline(self, limit_per_request: int = 200, max_requests: int = 100) -> int:
+        """
+        Fetch pages and download media as an overlapped producer/consumer pipeline
+
+        A producer task pulls filtered pages from iter_pages (the blocking
+        HTTP fetch runs on a worker thread) and feeds deduplicated items
+        into a bounded queue; download worker tasks consume from the queue
+        concurrently, so fetching and downloading overlap instead of
+        running as two serial phases.
+
+        Args:
+            limit_per_request: Number of items per API request (max 200)
+            max_requests: Maximum number of API requests to make
+
+        Returns:
+            Number of qualifying items fed into the download queue
+        """
+        target_images = self.config["target_images"]
+        target_videos = self.config["target_videos"]
+
+        self.limiter = AsyncLimiter(self.download_rate, 1)
+        queue = asyncio.Queue(maxsize=self.download_concurrency * 4)
+        seen_ids = set(self.downloaded_ids)
+        targets_reached = asyncio.Event()
+        enqueued = 0
+        processed = 0
+
+        async def producer():
+            nonlocal enqueued
+            pages = self.iter_pages(limit_per_request, max_requests)
+            try:
+                while not targets_reached.is_set():
+                    # next() blocks on the network, so run it off-loop
+                    page = await asyncio.to_thread(next, pages, None)
+                    if page is None:
+                        break
+                    for item in page:
+                        # Drop duplicate and already-downloaded IDs up front
+                        item_id = item.get("id")
+                        if item_id is not None:
+                            item_id = normalize_id(item_id)
+                            if item_id in seen_ids:
+                                continue
+                            seen_ids.add(item_id)
+                        await queue.put(item)
+                        enqueued += 1
+            finally:
+                pages.close()
+                # One sentinel per worker so all of them drain and exit
+                for _ in range(self.download_concurrency):
+                    await queue.put(None)
+
+        async def worker(session):
+            nonlocal processed
+            while True:
+                item = await queue.get()
+                if item is None:
+                    return
+
+                # Skip if we already have enough of this type; cache the
+                # classification so download_media doesn't re-parse the URL
+                is_video = item.get("_is_video")
+                if is_video is None:
+                    is_video = item["_is_video"] = self._is_video(item.get("url", ""), item)
+
+                if is_video and self.stats["videos_downloaded"] >= target_videos:
+                    self.stats["videos_skipped"] += 1
+                elif not is_video and self.stats["images_downloaded"] >= target_images:
+                    self.stats["images_skipped"] += 1
+                else:
+                    await self.download_media(session, item)
+
+                if (self.stats["images_downloaded"] >= target_images and
+                        self.stats["videos_downloaded"] >= target_videos and
+                        not targets_reached.is_set()):
+                    print(f"\n✓ Reached target for both images and videos!")
+                    targets_reached.set()
+
+                processed += 1
+                if processed % 100 == 0:
+                    # Periodic progress update
+                    print(f"\n--- Progress Update ---")
+                    print(f"Processed: {processed}")
+                    print(f"Images: {self.stats['images_downloaded']}/{target_images}")
+                    print(f"Videos: {self.stats['videos_downloaded']}/{target_videos}")
+                    print(f"Errors: {self.stats['errors']}")
+                    print("-" * 40 + "\n")
+
+                    # Save progress periodically
+                    self._save_downloaded_ids()
+                    self._save_metadata_shard()
+                    self._save_config()
+
+        # One session for the whole run so the connection pool is reused
+        connector = aiohttp.TCPConnector(limit=self.download_concurrency)
+        timeout = aiohttp.ClientTimeout(total=60)
+        async with aiohttp.ClientSession(connector=connector, headers=self.headers,
+                                         timeout=timeout) as session:
+            await asyncio.gather(
+                producer(),
+                *[worker(session) for _ in range(self.download_concurrency)]
+            )
+
+        return enqueued
     
     def run(self):
         """
@@ -357,56 +639,23 @@ class CivitaiScraper:
         print("="*60)
         
         start_time = datetime.now()
-        
-        # Fetch items from API
+
+        print(f"\n{'='*60}")
+        print(f"Starting fetch/download pipeline...")
+        print(f"{'='*60}\n")
+
+        # Fetch and download concurrently (downloads start on the first page)
         max_pages = self.config["max_pages"]
-        items = self.fetch_images(max_requests=max_pages)
-        
-        if not items:
+        fetched = asyncio.run(self._run_pipeline(max_requests=max_pages))
+
+        if not fetched:
             print("\n⚠ No items found matching criteria")
             self._save_config()
             return
-        
-        print(f"\n{'='*60}")
-        print(f"Starting downloads...")
-        print(f"{'='*60}\n")
-        
-        # Download media files
-        for idx, item in enumerate(items, 1):
-            # Check if we've reached targets
-            if (self.stats["images_downloaded"] >= target_images and 
-                self.stats["videos_downloaded"] >= target_videos):
-                print(f"\n✓ Reached target for both images and videos!")
-                break
-            
-            # Skip if we already have enough of this type
-            is_video = self._is_video(item.get("url", ""), item)
-            if is_video and self.stats["videos_downloaded"] >= target_videos:
-                self.stats["videos_skipped"] += 1
-                continue
-            if not is_video and self.stats["images_downloaded"] >= target_images:
-                self.stats["images_skipped"] += 1
-                continue
-            
-            # Download the item
-            result = self.download_media(item)
-            
-            # Periodic progress update
-            if idx % 100 == 0:
-                print(f"\n--- Progress Update ---")
-                print(f"Processed: {idx}/{len(items)}")
-                print(f"Images: {self.stats['images_downloaded']}/{target_images}")
-                print(f"Videos: {self.stats['videos_downloaded']}/{target_videos}")
-                print(f"Errors: {self.stats['errors']}")
-                print("-" * 40 + "\n")
-            
-            # Save progress periodically
-            if idx % 50 == 0:
-                self._save_downloaded_ids()
-                self._save_config()
-        
-        # Final save
-        self._save_downloaded_ids()
+
+        # Final save (compacted binary snapshot + remaining metadata)
+        self._save_metadata_shard()
+        self._save_id_snapshot()
         
         # Update config with end time
         self.config["end_time"] = datetime.now().isoformat()
@@ -6,13 +6,25 @@ Usage:
     python server.py [--port 8082] [--host 0.0.0.0] [--image_dir /path/to/images] [--jsonl docci/oct_21_examples.jsonlines]
 """
 
-import http.server
-import socketserver
+import os
 import json
+import gzip
+import mmap
+import socket
 import argparse
+import threading
 from pathlib import Path
-from urllib.parse import unquote, parse_qs, urlparse
-import base64
+from urllib.parse import unquote
+
+from aiohttp import web
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# orjson parses straight from the mapped bytes; json.loads also accepts bytes
+_loads = orjson.loads if orjson is not None else json.loads
 
 # Default configuration
 SCRIPT_DIR = Path(__file__).parent.resolve()
@@ -21,149 +33,198 @@ DEFAULT_IMAGE_DIR = Path("/project_data/ramanan/yuhanhua/test_images")
 PORT = 8082
 HOST = "0.0.0.0"
 
+# Built once at import; handlers index into these instead of rebuilding
+# a dict and header strings per request
+CONTENT_TYPES = {
+    '.jpg': 'image/jpeg',
+    '.jpeg': 'image/jpeg',
+    '.png': 'image/png',
+    '.gif': 'image/gif',
+    '.webp': 'image/webp'
+}
+IMAGE_HEADERS = {
+    'Access-Control-Allow-Origin': '*',
+    'Cache-Control': 'public, max-age=86400'
+}
 
-class DOCCIViewerHandler(http.server.SimpleHTTPRequestHandler):
-    """Custom handler for the DOCCI viewer."""
 
-    def __init__(self, *args, jsonl_path=None, image_dir=None, **kwargs):
-        self.jsonl_path = jsonl_path
-        self.image_dir = image_dir
-        self._data_cache = None
-        super().__init__(*args, **kwargs)
+class APIAccessLogger(web.AbstractAccessLogger):
+    """Only log API requests."""
 
-    def do_GET(self):
-        """Handle GET requests."""
-        
-        # API endpoint: Get all DOCCI examples
-        if self.path == "/api/examples":
-            self.send_json_response(self.get_examples())
+    def log(self, request, response, time):
+        # Cheap prefix check first; non-API traffic returns before any
+        # string formatting happens
+        if not request.path.startswith('/api/'):
             return
-        
-        # API endpoint: Get statistics
-        if self.path == "/api/stats":
-            self.send_json_response(self.get_stats())
-            return
-        
-        # API endpoint: Serve images
-        if self.path.startswith("/api/image/"):
-            image_file = unquote(self.path.split("/api/image/")[1])
-            self.serve_image(image_file)
-            return
-        
-        # Serve static files (HTML, CSS, JS)
-        super().do_GET()
-
-    def load_data(self):
-        """Load and cache JSONL data."""
-        if self._data_cache is not None:
-            return self._data_cache
-        
-        examples = []
+        print(f"{request.remote} - {request.method} {request.path} {response.status}")
+
+
+def get_local_ip(timeout=0.5):
+    """
+    Resolve this host's IP without letting DNS delay startup.
+
+    gethostbyname can block for seconds on misconfigured resolvers, so
+    run it on a daemon thread and give up after `timeout` — the banner
+    just omits the LAN URL in that case.
+    """
+    result = []
+
+    def resolve():
         try:
-            with open(self.jsonl_path, 'r', encoding='utf-8') as f:
+            result.append(socket.gethostbyname(socket.gethostname()))
+        except OSError:
+            pass
+
+    t = threading.Thread(target=resolve, daemon=True)
+    t.start()
+    t.join(timeout)
+    return result[0] if result else None
+
+
+def load_data(jsonl_path):
+    """Load JSONL data from a read-only memory map."""
+    examples = []
+    try:
+        # Parsing from the mapped pages avoids copying the file into an
+        # intermediate string before decoding each line. Files that can't
+        # be mapped (notably zero-length ones) fall back to large-buffer
+        # binary reads — still bytes end to end, never a text decode.
+        with open(jsonl_path, 'rb', buffering=1 << 20) as f:
+            try:
+                source = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except (ValueError, OSError):
+                source = None
+
+            if source is not None:
+                with source as mm:
+                    for line in iter(mm.readline, b''):
+                        if line.strip():
+                            examples.append(_loads(line))
+            else:
                 for line in f:
-                    line = line.strip()
-                    if line:
-                        examples.append(json.loads(line))
-            
-            self._data_cache = examples
-            print(f"Loaded {len(examples)} examples from {self.jsonl_path}")
-            return examples
-        except Exception as e:
-            print(f"Error loading JSONL: {e}")
-            import traceback
-            traceback.print_exc()
-            return []
-
-    def get_examples(self):
-        """Get all examples."""
-        return self.load_data()
-
-    def get_stats(self):
-        """Calculate statistics about the dataset."""
-        examples = self.load_data()
-        
-        if not examples:
-            return {
-                "total": 0,
-                "avg_original_length": 0,
-                "avg_compressed_length": 0,
-                "compression_ratio": 0
-            }
-        
-        total = len(examples)
-        total_orig_len = sum(len(ex.get('description_original', '')) for ex in examples)
-        total_comp_len = sum(len(ex.get('description', '')) for ex in examples)
-        
-        avg_orig = total_orig_len / total if total > 0 else 0
-        avg_comp = total_comp_len / total if total > 0 else 0
-        compression_ratio = (1 - avg_comp / avg_orig) * 100 if avg_orig > 0 else 0
-        
+                    if line.strip():
+                        examples.append(_loads(line))
+
+        print(f"Loaded {len(examples)} examples from {jsonl_path}")
+        return examples
+    except Exception as e:
+        print(f"Error loading JSONL: {e}")
+        import traceback
+        traceback.print_exc()
+        return []
+
+
+def get_stats(examples):
+    """Calculate statistics about the dataset."""
+    if not examples:
         return {
-            "total": total,
-            "avg_original_length": round(avg_orig, 1),
-            "avg_compressed_length": round(avg_comp, 1),
-            "compression_ratio": round(compression_ratio, 1)
+            "total": 0,
+            "avg_original_length": 0,
+            "avg_compressed_length": 0,
+            "compression_ratio": 0
         }
 
-    def serve_image(self, image_file):
-        """Serve an image file."""
-        try:
-            image_path = self.image_dir / image_file
-            
-            if not image_path.exists():
-                self.send_error(404, f"Image not found: {image_file}")
-                return
-            
-            # Determine content type
-            suffix = image_path.suffix.lower()
-            content_types = {
-                '.jpg': 'image/jpeg',
-                '.jpeg': 'image/jpeg',
-                '.png': 'image/png',
-                '.gif': 'image/gif',
-                '.webp': 'image/webp'
-            }
-            content_type = content_types.get(suffix, 'application/octet-stream')
-            
-            # Read and send image
-            with open(image_path, 'rb') as f:
-                image_data = f.read()
-            
-            self.send_response(200)
-            self.send_header('Content-Type', content_type)
-            self.send_header('Content-Length', len(image_data))
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.send_header('Cache-Control', 'public, max-age=86400')
-            self.end_headers()
-            self.wfile.write(image_data)
-            
-        except Exception as e:
-            print(f"Error serving image {image_file}: {e}")
-            self.send_error(500, str(e))
-
-    def send_json_response(self, data):
-        """Send a JSON response."""
-        self.send_response(200)
-        self.send_header('Content-Type', 'application/json')
-        self.send_header('Access-Control-Allow-Origin', '*')
-        self.end_headers()
-        self.wfile.write(json.dumps(data, ensure_ascii=False, indent=2).encode('utf-8'))
-
-    def log_message(self, format, *args):
-        """Override to customize logging."""
-        try:
-            if args and len(args) > 0 and isinstance(args[0], str) and "api" in args[0]:
-                print(f"{self.address_string()} - {format % args}")
-        except:
-            pass
+    # Single pass over the examples; this runs once at startup and the
+    # result is served from the pre-serialized payload thereafter
+    total = len(examples)
+    total_orig_len = 0
+    total_comp_len = 0
+    for ex in examples:
+        total_orig_len += len(ex.get('description_original', ''))
+        total_comp_len += len(ex.get('description', ''))
+
+    avg_orig = total_orig_len / total if total > 0 else 0
+    avg_comp = total_comp_len / total if total > 0 else 0
+    compression_ratio = (1 - avg_comp / avg_orig) * 100 if avg_orig > 0 else 0
 
+    return {
+        "total": total,
+        "avg_original_length": round(avg_orig, 1),
+        "avg_compressed_length": round(avg_comp, 1),
+        "compression_ratio": round(compression_ratio, 1)
+    }
 
-def create_handler(jsonl_path, image_dir):
-    """Create a handler with the specified paths."""
-    def handler(*args, **kwargs):
-        return DOCCIViewerHandler(*args, jsonl_path=jsonl_path, image_dir=image_dir, **kwargs)
-    return handler
+
+def dump_json_bytes(data):
+    """Serialize to JSON bytes, using orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, ensure_ascii=False).encode('utf-8')
+
+
+def cached_json_response(request, name):
+    """Serve a payload pre-serialized (and pre-compressed) at startup."""
+    headers = {'Access-Control-Allow-Origin': '*'}
+    if 'gzip' in request.headers.get('Accept-Encoding', ''):
+        headers['Content-Encoding'] = 'gzip'
+        body = request.app[f'{name}_gz']
+    else:
+        body = request.app[f'{name}_json']
+    return web.Response(body=body, content_type='application/json', headers=headers)
+
+
+async def handle_examples(request):
+    """Get all examples."""
+    return cached_json_response(request, 'examples')
+
+
+async def handle_stats(request):
+    """Get statistics."""
+    return cached_json_response(request, 'stats')
+
+
+async def handle_image(request):
+    """Serve an image file."""
+    image_file = unquote(request.match_info['filename'])
+    try:
+        image_path = request.app['image_dir'] / image_file
+
+        if not image_path.exists():
+            raise web.HTTPNotFound(text=f"Image not found: {image_file}")
+
+        # Determine content type
+        content_type = CONTENT_TYPES.get(image_path.suffix.lower(),
+                                         'application/octet-stream')
+
+        # FileResponse sends via sendfile: the kernel copies pages straight
+        # from page cache to the socket instead of through userspace
+        response = web.FileResponse(image_path, headers=IMAGE_HEADERS)
+        response.content_type = content_type
+        return response
+
+    except web.HTTPException:
+        raise
+    except Exception as e:
+        print(f"Error serving image {image_file}: {e}")
+        raise web.HTTPInternalServerError(text=str(e))
+
+
+async def handle_index(request):
+    """Serve the viewer page."""
+    return web.FileResponse(SCRIPT_DIR / "index.html")
+
+
+def create_app(jsonl_path, image_dir):
+    """Create the application with the specified paths."""
+    app = web.Application()
+    app['image_dir'] = image_dir
+
+    # Parse, serialize and compress eagerly, before the socket is even
+    # bound: no request ever pays for the load, and a bad JSONL path
+    # surfaces at startup rather than on first hit
+    app['examples'] = load_data(jsonl_path)
+    app['examples_json'] = dump_json_bytes(app['examples'])
+    app['examples_gz'] = gzip.compress(app['examples_json'], 6)
+    stats = get_stats(app['examples'])
+    app['stats_json'] = dump_json_bytes(stats)
+    app['stats_gz'] = gzip.compress(app['stats_json'], 6)
+
+    app.router.add_get('/api/examples', handle_examples)
+    app.router.add_get('/api/stats', handle_stats)
+    app.router.add_get('/api/image/{filename:.+}', handle_image)
+    app.router.add_get('/', handle_index)
+    app.router.add_get('/index.html', handle_index)
+    return app
 
 
 def main():
@@ -177,50 +238,48 @@ def main():
     # Set paths
     jsonl_path = Path(args.jsonl) if args.jsonl else DEFAULT_JSONL
     image_dir = Path(args.image_dir) if args.image_dir else DEFAULT_IMAGE_DIR
-    
+
     # Check if files exist
     if not jsonl_path.exists():
         print(f"⚠️  Warning: JSONL file not found at {jsonl_path}")
         print(f"    Please provide a valid path with --jsonl")
     else:
         print(f"✓ Found JSONL file: {jsonl_path.resolve()}")
-    
+
     if not image_dir.exists():
         print(f"⚠️  Warning: Image directory not found at {image_dir}")
         print(f"    Please provide a valid path with --image_dir")
     else:
-        image_count = len(list(image_dir.glob('*.jpg'))) + len(list(image_dir.glob('*.png')))
+        # One scandir pass instead of a glob traversal per extension
+        with os.scandir(image_dir) as it:
+            image_count = sum(1 for e in it
+                              if e.is_file(follow_symlinks=False)
+                              and e.name.lower().endswith(('.jpg', '.png')))
         print(f"✓ Found image directory with {image_count} images")
-    
-    # Change to the script directory to serve index.html
-    import os
-    os.chdir(SCRIPT_DIR)
-    
-    # Create handler with custom paths
-    handler = create_handler(jsonl_path, image_dir)
-    
-    # Create server
-    with socketserver.TCPServer((args.host, args.port), handler) as httpd:
-        print("=" * 60)
-        print(f"🖼️  DOCCI Viewer Server")
-        print("=" * 60)
-        print(f"📁 JSONL:        {jsonl_path.resolve()}")
-        print(f"📁 Images:       {image_dir.resolve()}")
-        print(f"🌐 Server:       http://{args.host}:{args.port}")
-        if args.host == "0.0.0.0":
-            import socket
-            hostname = socket.gethostname()
-            local_ip = socket.gethostbyname(hostname)
+
+    # Create app with custom paths
+    app = create_app(jsonl_path, image_dir)
+
+    print("=" * 60)
+    print(f"🖼️  DOCCI Viewer Server")
+    print("=" * 60)
+    print(f"📁 JSONL:        {jsonl_path.resolve()}")
+    print(f"📁 Images:       {image_dir.resolve()}")
+    print(f"🌐 Server:       http://{args.host}:{args.port}")
+    if args.host == "0.0.0.0":
+        local_ip = get_local_ip()
+        if local_ip:
             print(f"🔗 Local URL:    http://{local_ip}:{args.port}")
-            print(f"🔗 Localhost:    http://localhost:{args.port}")
-        print("=" * 60)
-        print("\n✨ Server is running. Press Ctrl+C to stop.\n")
-        
-        try:
-            httpd.serve_forever()
-        except KeyboardInterrupt:
-            print("\n\n👋 Shutting down server...")
+        print(f"🔗 Localhost:    http://localhost:{args.port}")
+    print("=" * 60)
+    print("\n✨ Server is running. Press Ctrl+C to stop.\n")
+
+    try:
+        web.run_app(app, host=args.host, port=args.port,
+                    access_log_class=APIAccessLogger, print=None)
+    except KeyboardInterrupt:
+        print("\n\n👋 Shutting down server...")
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
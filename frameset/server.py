@@ -6,185 +6,397 @@ Usage:
     python server.py [--port 8084] [--host 0.0.0.0] [--images_dir ./images]
 """
 
-import http.server
-import socketserver
+import os
 import json
+import struct
+import socket
 import argparse
+import threading
+from collections import OrderedDict
 from pathlib import Path
 from urllib.parse import unquote
+from concurrent.futures import ThreadPoolExecutor
 import mimetypes
-import signal
-import sys
+
+from aiohttp import web
 from PIL import Image
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Default configuration
 SCRIPT_DIR = Path(__file__).parent.resolve()
 PORT = 8084
 HOST = "0.0.0.0"
 
+# Supported image formats (lowercase suffixes)
+IMAGE_EXTENSIONS = frozenset({'.jpg', '.jpeg', '.png', '.gif', '.webp', '.bmp'})
 
-class ReusableTCPServer(socketserver.TCPServer):
-    """TCP Server that allows address reuse to prevent 'Address already in use' errors."""
-    allow_reuse_address = True
-    
-    def server_bind(self):
-        """Bind the server with SO_REUSEADDR set."""
-        self.socket.setsockopt(socketserver.socket.SOL_SOCKET, socketserver.socket.SO_REUSEADDR, 1)
-        super().server_bind()
+# Built once at import; handlers index into these instead of consulting
+# mimetypes or rebuilding header dicts per request
+CONTENT_TYPES = {
+    '.jpg': 'image/jpeg',
+    '.jpeg': 'image/jpeg',
+    '.png': 'image/png',
+    '.gif': 'image/gif',
+    '.webp': 'image/webp',
+    '.bmp': 'image/bmp'
+}
+IMAGE_HEADERS = {
+    'Access-Control-Allow-Origin': '*',
+    'Cache-Control': 'public, max-age=86400'
+}
 
 
-class FramesetViewerHandler(http.server.SimpleHTTPRequestHandler):
-    """Custom handler for the frameset viewer."""
+def scan_images(images_dir):
+    """
+    Collect (path, size) for every supported image in one directory pass.
 
-    def __init__(self, *args, images_dir=None, **kwargs):
-        self.images_dir = images_dir
-        self._data_cache = None
-        super().__init__(*args, **kwargs)
+    A single os.scandir replaces one glob traversal per extension, and
+    DirEntry.stat() reuses the data scandir already fetched instead of
+    issuing another stat syscall per file.
+    """
+    found = []
+    with os.scandir(images_dir) as it:
+        for entry in it:
+            if not entry.is_file(follow_symlinks=False):
+                continue
+            dot = entry.name.rfind('.')
+            if dot != -1 and entry.name[dot:].lower() in IMAGE_EXTENSIONS:
+                found.append((Path(entry.path), entry.stat().st_size))
+    return found
 
-    def do_GET(self):
-        """Handle GET requests."""
-        
-        # API endpoint: Get all images
-        if self.path == "/api/images":
-            self.send_json_response(self.get_images())
-            return
-        
-        # API endpoint: Get statistics
-        if self.path == "/api/stats":
-            self.send_json_response(self.get_stats())
-            return
-        
-        # API endpoint: Serve image
-        if self.path.startswith("/api/image/"):
-            image_file = unquote(self.path.split("/api/image/")[1])
-            self.serve_image(image_file)
+
+class APIAccessLogger(web.AbstractAccessLogger):
+    """Only log API requests."""
+
+    def log(self, request, response, time):
+        # Cheap prefix check first; non-API traffic returns before any
+        # string formatting happens
+        if not request.path.startswith('/api/'):
             return
-        
-        # Serve static files (HTML, CSS, JS)
-        super().do_GET()
-
-    def load_data(self):
-        """Load and cache image data."""
-        if self._data_cache is not None:
-            return self._data_cache
-        
-        images = []
+        print(f"{request.remote} - {request.method} {request.path} {response.status}")
+
+
+def get_local_ip(timeout=0.5):
+    """
+    Resolve this host's IP without letting DNS delay startup.
+
+    gethostbyname can block for seconds on misconfigured resolvers, so
+    run it on a daemon thread and give up after `timeout` — the banner
+    just omits the LAN URL in that case.
+    """
+    result = []
+
+    def resolve():
         try:
-            if self.images_dir.exists():
-                # Supported image formats
-                extensions = ['*.jpg', '*.jpeg', '*.png', '*.gif', '*.webp', '*.bmp']
-                
-                for ext in extensions:
-                    for img_path in self.images_dir.glob(ext):
-                        try:
-                            # Get image dimensions and file size
-                            with Image.open(img_path) as img:
-                                width, height = img.size
-                            
-                            file_size = img_path.stat().st_size
-                            
-                            images.append({
-                                "filename": img_path.name,
-                                "width": width,
-                                "height": height,
-                                "file_size": file_size,
-                                "format": img_path.suffix[1:].upper()
-                            })
-                        except Exception as e:
-                            print(f"Error loading {img_path.name}: {e}")
-            
-            # Sort by filename
-            images.sort(key=lambda x: x['filename'])
-            
-            self._data_cache = images
-            print(f"✓ Loaded {len(images)} images from {self.images_dir}")
-            return images
-        except Exception as e:
-            print(f"Error loading images: {e}")
-            import traceback
-            traceback.print_exc()
-            return []
-
-    def get_images(self):
-        """Get all images."""
-        return self.load_data()
-
-    def get_stats(self):
-        """Calculate statistics about the images."""
-        images = self.load_data()
-        
-        if not images:
-            return {
-                "total": 0,
-                "total_size": 0,
-                "avg_width": 0,
-                "avg_height": 0
-            }
-        
-        total = len(images)
-        total_size = sum(img['file_size'] for img in images)
-        avg_width = sum(img['width'] for img in images) / total
-        avg_height = sum(img['height'] for img in images) / total
-        
+            result.append(socket.gethostbyname(socket.gethostname()))
+        except OSError:
+            pass
+
+    t = threading.Thread(target=resolve, daemon=True)
+    t.start()
+    t.join(timeout)
+    return result[0] if result else None
+
+
+def _fast_dim(path):
+    """
+    Read image dimensions from the file header without a full PIL open.
+
+    Handles PNG, GIF, BMP, WEBP and JPEG (SOF marker scan) from the
+    first few bytes. Returns (width, height), or None when the header
+    isn't recognized so the caller can fall back to PIL.
+    """
+    with open(path, 'rb') as f:
+        head = f.read(32)
+        if len(head) < 12:
+            return None
+
+        # PNG: IHDR width/height at fixed offsets
+        if head[:8] == b'\x89PNG\r\n\x1a\n':
+            return struct.unpack('>II', head[16:24])
+
+        # GIF: logical screen descriptor
+        if head[:6] in (b'GIF87a', b'GIF89a'):
+            return struct.unpack('<HH', head[6:10])
+
+        # BMP: BITMAPINFOHEADER (height may be negative for top-down rows)
+        if head[:2] == b'BM' and len(head) >= 26:
+            width, height = struct.unpack('<ii', head[18:26])
+            return width, abs(height)
+
+        # WEBP: RIFF container, dimensions depend on the chunk flavor
+        if head[:4] == b'RIFF' and head[8:12] == b'WEBP':
+            chunk = head[12:16]
+            if chunk == b'VP8X' and len(head) >= 30:
+                return (int.from_bytes(head[24:27], 'little') + 1,
+                        int.from_bytes(head[27:30], 'little') + 1)
+            if chunk == b'VP8L' and len(head) >= 25:
+                bits = int.from_bytes(head[21:25], 'little')
+                return (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+            if chunk == b'VP8 ' and len(head) >= 30:
+                width, height = struct.unpack('<HH', head[26:30])
+                return width & 0x3FFF, height & 0x3FFF
+            return None
+
+        # JPEG: walk segment markers until a start-of-frame header
+        if head[:2] == b'\xff\xd8':
+            f.seek(2)
+            while True:
+                marker = f.read(2)
+                if len(marker) < 2 or marker[0] != 0xFF:
+                    return None
+                code = marker[1]
+                if code == 0xFF:
+                    continue
+                if code in (0x01,) or 0xD0 <= code <= 0xD9:
+                    continue
+                length = f.read(2)
+                if len(length) < 2:
+                    return None
+                seg_len = struct.unpack('>H', length)[0]
+                if 0xC0 <= code <= 0xCF and code not in (0xC4, 0xC8, 0xCC):
+                    body = f.read(5)
+                    if len(body) < 5:
+                        return None
+                    height, width = struct.unpack('>HH', body[1:5])
+                    return width, height
+                f.seek(seg_len - 2, 1)
+
+    return None
+
+
+def load_data(images_dir):
+    """Load image data."""
+    images = []
+    try:
+        if images_dir.exists():
+            found = scan_images(images_dir)
+
+            def probe(found_entry):
+                img_path, file_size = found_entry
+                try:
+                    # Get image dimensions from the header bytes, falling
+                    # back to PIL for anything the fast parser doesn't know
+                    dims = _fast_dim(img_path)
+                    if dims is None:
+                        with Image.open(img_path) as img:
+                            dims = img.size
+                    width, height = dims
+
+                    return {
+                        "filename": img_path.name,
+                        "width": width,
+                        "height": height,
+                        "file_size": file_size,
+                        "format": img_path.suffix[1:].upper()
+                    }
+                except Exception as e:
+                    print(f"Error loading {img_path.name}: {e}")
+                    return None
+
+            # Each file is probed independently, so overlap the disk reads
+            with ThreadPoolExecutor(max_workers=32) as executor:
+                images = [entry for entry in executor.map(probe, found) if entry is not None]
+
+        # Sort by filename
+        images.sort(key=lambda x: x['filename'])
+
+        print(f"✓ Loaded {len(images)} images from {images_dir}")
+        return images
+    except Exception as e:
+        print(f"Error loading images: {e}")
+        import traceback
+        traceback.print_exc()
+        return []
+
+
+def get_stats(images):
+    """Calculate statistics about the images."""
+    if not images:
         return {
-            "total": total,
-            "total_size": total_size,
-            "avg_width": round(avg_width, 1),
-            "avg_height": round(avg_height, 1)
+            "total": 0,
+            "total_size": 0,
+            "avg_width": 0,
+            "avg_height": 0
         }
 
-    def serve_image(self, image_file):
-        """Serve an image file."""
+    total = len(images)
+    total_size = sum(img['file_size'] for img in images)
+    avg_width = sum(img['width'] for img in images) / total
+    avg_height = sum(img['height'] for img in images) / total
+
+    return {
+        "total": total,
+        "total_size": total_size,
+        "avg_width": round(avg_width, 1),
+        "avg_height": round(avg_height, 1)
+    }
+
+
+def dump_json_bytes(data):
+    """Serialize to compact JSON bytes, using orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, ensure_ascii=False).encode('utf-8')
+
+
+def json_response(data):
+    """Build a JSON response."""
+    return web.Response(
+        body=dump_json_bytes(data),
+        content_type='application/json',
+        headers={'Access-Control-Allow-Origin': '*'}
+    )
+
+
+async def handle_images(request):
+    """Get all images, streamed one record at a time."""
+    # Writing per record keeps peak memory at O(one entry) instead of
+    # materializing the whole serialized listing
+    response = web.StreamResponse(headers={'Access-Control-Allow-Origin': '*'})
+    response.content_type = 'application/json'
+    await response.prepare(request)
+
+    await response.write(b'[')
+    for i, img in enumerate(request.app['images']):
+        if i:
+            await response.write(b',')
+        await response.write(dump_json_bytes(img))
+    await response.write(b']')
+    await response.write_eof()
+    return response
+
+
+async def handle_stats(request):
+    """Get statistics."""
+    return web.Response(
+        body=request.app['stats_json'],
+        content_type='application/json',
+        headers={'Access-Control-Allow-Origin': '*'}
+    )
+
+
+# Bounded LRU cache of small image bodies: dashboards refetch the same
+# thumbnails over and over, so hot files are served straight from memory.
+# Keys carry mtime and size, so an edited file misses and re-reads.
+_IMG_CACHE = OrderedDict()
+_IMG_CACHE_BYTES = 0
+_IMG_CACHE_BUDGET = 256 * 1024 * 1024
+_IMG_CACHE_MAX_FILE = 1024 * 1024
+
+
+def _cached_image_body(path):
+    """
+    Return the file's bytes from the LRU cache, reading on a miss.
+
+    Files over the per-file limit return None so the caller falls back
+    to sendfile; caching them would churn the whole budget.
+    """
+    global _IMG_CACHE_BYTES
+
+    st = os.stat(path)
+    if st.st_size > _IMG_CACHE_MAX_FILE:
+        return None
+
+    key = (str(path), st.st_mtime_ns, st.st_size)
+    body = _IMG_CACHE.get(key)
+    if body is not None:
+        _IMG_CACHE.move_to_end(key)
+        return body
+
+    with open(path, 'rb') as f:
+        body = f.read()
+
+    _IMG_CACHE[key] = body
+    _IMG_CACHE_BYTES += len(body)
+    while _IMG_CACHE_BYTES > _IMG_CACHE_BUDGET:
+        _, evicted = _IMG_CACHE.popitem(last=False)
+        _IMG_CACHE_BYTES -= len(evicted)
+    return body
+
+
+def _readahead(path):
+    """
+    Ask the kernel to start reading the file before sendfile needs it.
+
+    When a dashboard pulls dozens of frames in parallel, the WILLNEED
+    hints batch into one readahead queue, so cold files stream without
+    each sendfile stalling on its first page fault.
+    """
+    if not hasattr(os, 'posix_fadvise'):
+        return
+    try:
+        fd = os.open(path, os.O_RDONLY)
         try:
-            image_path = self.images_dir / image_file
-            
-            if not image_path.exists():
-                self.send_error(404, f"Image not found: {image_file}")
-                return
-            
-            # Determine content type
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+        finally:
+            os.close(fd)
+    except OSError:
+        pass
+
+
+async def handle_image(request):
+    """Serve an image file."""
+    image_file = unquote(request.match_info['filename'])
+    try:
+        image_path = request.app['images_dir'] / image_file
+
+        if not image_path.exists():
+            raise web.HTTPNotFound(text=f"Image not found: {image_file}")
+
+        # Determine content type
+        content_type = CONTENT_TYPES.get(image_path.suffix.lower())
+        if not content_type:
             content_type, _ = mimetypes.guess_type(str(image_path))
-            if not content_type:
-                content_type = 'application/octet-stream'
-            
-            # Read and send image
-            with open(image_path, 'rb') as f:
-                image_data = f.read()
-            
-            self.send_response(200)
-            self.send_header('Content-Type', content_type)
-            self.send_header('Content-Length', len(image_data))
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.send_header('Cache-Control', 'public, max-age=86400')
-            self.end_headers()
-            self.wfile.write(image_data)
-            
-        except Exception as e:
-            print(f"Error serving image {image_file}: {e}")
-            self.send_error(500, str(e))
-
-    def send_json_response(self, data):
-        """Send a JSON response."""
-        self.send_response(200)
-        self.send_header('Content-Type', 'application/json')
-        self.send_header('Access-Control-Allow-Origin', '*')
-        self.end_headers()
-        self.wfile.write(json.dumps(data, ensure_ascii=False, indent=2).encode('utf-8'))
-
-    def log_message(self, format, *args):
-        """Override to customize logging."""
-        try:
-            if args and len(args) > 0 and isinstance(args[0], str) and "api" in args[0]:
-                print(f"{self.address_string()} - {format % args}")
-        except:
-            pass
+            content_type = content_type or 'application/octet-stream'
+
+        # Hot thumbnails come straight from the in-memory LRU cache
+        body = _cached_image_body(image_path)
+        if body is not None:
+            return web.Response(body=body, content_type=content_type,
+                                headers=IMAGE_HEADERS)
+
+        _readahead(image_path)
+
+        # Large files stay on the sendfile path: the kernel copies pages
+        # straight from page cache to the socket instead of through userspace
+        response = web.FileResponse(image_path, headers=IMAGE_HEADERS)
+        response.content_type = content_type
+        return response
+
+    except web.HTTPException:
+        raise
+    except Exception as e:
+        print(f"Error serving image {image_file}: {e}")
+        raise web.HTTPInternalServerError(text=str(e))
+
+
+async def handle_index(request):
+    """Serve the viewer page."""
+    return web.FileResponse(SCRIPT_DIR / "index.html")
 
 
-def create_handler(images_dir):
-    """Create a handler with the specified paths."""
-    def handler(*args, **kwargs):
-        return FramesetViewerHandler(*args, images_dir=images_dir, **kwargs)
-    return handler
+def create_app(images_dir):
+    """Create the application with the specified paths."""
+    app = web.Application()
+    app['images_dir'] = images_dir
+
+    # Scan eagerly, before the socket is bound, so the shared list is
+    # warm for every request the event loop serves concurrently; stats
+    # over an immutable listing serialize once here instead of per hit
+    app['images'] = load_data(images_dir)
+    app['stats_json'] = dump_json_bytes(get_stats(app['images']))
+
+    app.router.add_get('/api/images', handle_images)
+    app.router.add_get('/api/stats', handle_stats)
+    app.router.add_get('/api/image/{filename:.+}', handle_image)
+    app.router.add_get('/', handle_index)
+    app.router.add_get('/index.html', handle_index)
+    return app
 
 
 def main():
@@ -196,64 +408,43 @@ def main():
 
     # Set paths
     images_dir = Path(args.images_dir).resolve()
-    
+
     # Check if directory exists
     print("=" * 60)
     print("🔍 Checking directories...")
     print("=" * 60)
-    
+
     if not images_dir.exists():
         print(f"⚠️  Warning: Images directory not found at {images_dir}")
         images_dir.mkdir(parents=True, exist_ok=True)
         print(f"    Created empty directory")
     else:
         # Count images
-        image_count = sum(1 for _ in images_dir.glob('*.[jJ][pP]*[gG]'))
-        image_count += sum(1 for _ in images_dir.glob('*.[pP][nN][gG]'))
+        image_count = len(scan_images(images_dir))
         print(f"✓ Found {image_count} images in {images_dir}")
-    
-    # Change to the script directory to serve index.html
-    import os
-    os.chdir(SCRIPT_DIR)
-    
-    # Create handler with custom paths
-    handler = create_handler(images_dir)
-    
-    # Create server with address reuse
-    httpd = ReusableTCPServer((args.host, args.port), handler)
-    
-    # Set up signal handler for graceful shutdown
-    def signal_handler(sig, frame):
-        print("\n\n👋 Shutting down server gracefully...")
-        httpd.shutdown()
-        sys.exit(0)
-    
-    signal.signal(signal.SIGINT, signal_handler)
-    signal.signal(signal.SIGTERM, signal_handler)
-    
+
+    # Create app with custom paths
+    app = create_app(images_dir)
+
     print("\n" + "=" * 60)
     print(f"🎞️  Frameset Viewer Server")
     print("=" * 60)
     print(f"📁 Images dir:   {images_dir}")
     print(f"🌐 Server:       http://{args.host}:{args.port}")
     if args.host == "0.0.0.0":
-        import socket
-        hostname = socket.gethostname()
-        try:
-            local_ip = socket.gethostbyname(hostname)
+        local_ip = get_local_ip()
+        if local_ip:
             print(f"🔗 Local URL:    http://{local_ip}:{args.port}")
-        except:
-            pass
         print(f"🔗 Localhost:    http://localhost:{args.port}")
     print("=" * 60)
     print("\n✨ Server is running. Press Ctrl+C to stop.\n")
-    
+
     try:
-        httpd.serve_forever()
+        web.run_app(app, host=args.host, port=args.port,
+                    access_log_class=APIAccessLogger, print=None)
     except KeyboardInterrupt:
         print("\n\n👋 Shutting down server...")
-        httpd.shutdown()
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -8,64 +8,230 @@ Usage:
 
 import http.server
 import socketserver
+import gzip
 import json
+import os
+import re
+import struct
 import argparse
+from email.utils import parsedate_to_datetime
 from pathlib import Path
 from urllib.parse import unquote, urlparse
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 import mimetypes
 import signal
+import socket
 import sys
+import threading
 from PIL import Image
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# orjson parses bytes directly; json.loads also accepts bytes
+_loads = orjson.loads if orjson is not None else json.loads
+
 SCRIPT_DIR = Path(__file__).parent.resolve()
 PORT = 8080
 HOST = "0.0.0.0"
 
+# Resolved once; media handlers only ever serve names scanned out of
+# these roots, so request paths can't traverse elsewhere
+CIVITAI_IMAGES_DIR = SCRIPT_DIR / 'civitai' / 'images'
+CIVITAI_VIDEOS_DIR = SCRIPT_DIR / 'civitai' / 'videos'
+FRAMESET_IMAGES_DIR = SCRIPT_DIR / 'frameset' / 'images'
+
+# Range header as sent by browsers seeking in <video>: "bytes=start-[end]"
+_RANGE_RE = re.compile(r'bytes=(\d+)-(\d*)$')
+
+# Supported frameset image formats (lowercase suffixes)
+FRAMESET_EXTENSIONS = frozenset({'.jpg', '.jpeg', '.png', '.gif', '.webp', '.bmp'})
+
+# Load the mime registry once; guess_type re-tokenizes its input every
+# call, so resolutions are cached per suffix
+mimetypes.init()
+
+
+@lru_cache(maxsize=64)
+def _ct_for_suffix(suffix):
+    content_type, _ = mimetypes.guess_type('x' + suffix)
+    return content_type or 'application/octet-stream'
+
+
+def _fast_dim(path):
+    """
+    Read image dimensions from the file header without a full PIL open.
+
+    Handles PNG, GIF, BMP, WEBP and JPEG (SOF marker scan) from the
+    first few bytes. Returns (width, height), or None when the header
+    isn't recognized so the caller can fall back to PIL.
+    """
+    with open(path, 'rb') as f:
+        head = f.read(32)
+        if len(head) < 12:
+            return None
+
+        # PNG: IHDR width/height at fixed offsets
+        if head[:8] == b'\x89PNG\r\n\x1a\n':
+            return struct.unpack('>II', head[16:24])
+
+        # GIF: logical screen descriptor
+        if head[:6] in (b'GIF87a', b'GIF89a'):
+            return struct.unpack('<HH', head[6:10])
+
+        # BMP: BITMAPINFOHEADER (height may be negative for top-down rows)
+        if head[:2] == b'BM' and len(head) >= 26:
+            width, height = struct.unpack('<ii', head[18:26])
+            return width, abs(height)
+
+        # WEBP: RIFF container, dimensions depend on the chunk flavor
+        if head[:4] == b'RIFF' and head[8:12] == b'WEBP':
+            chunk = head[12:16]
+            if chunk == b'VP8X' and len(head) >= 30:
+                return (int.from_bytes(head[24:27], 'little') + 1,
+                        int.from_bytes(head[27:30], 'little') + 1)
+            if chunk == b'VP8L' and len(head) >= 25:
+                bits = int.from_bytes(head[21:25], 'little')
+                return (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+            if chunk == b'VP8 ' and len(head) >= 30:
+                width, height = struct.unpack('<HH', head[26:30])
+                return width & 0x3FFF, height & 0x3FFF
+            return None
+
+        # JPEG: walk segment markers until a start-of-frame header
+        if head[:2] == b'\xff\xd8':
+            f.seek(2)
+            while True:
+                marker = f.read(2)
+                if len(marker) < 2 or marker[0] != 0xFF:
+                    return None
+                code = marker[1]
+                if code == 0xFF:
+                    continue
+                if code in (0x01,) or 0xD0 <= code <= 0xD9:
+                    continue
+                length = f.read(2)
+                if len(length) < 2:
+                    return None
+                seg_len = struct.unpack('>H', length)[0]
+                if 0xC0 <= code <= 0xCF and code not in (0xC4, 0xC8, 0xCC):
+                    body = f.read(5)
+                    if len(body) < 5:
+                        return None
+                    height, width = struct.unpack('>HH', body[1:5])
+                    return width, height
+                f.seek(seg_len - 2, 1)
+
+    return None
 
-class ReusableTCPServer(socketserver.TCPServer):
+
+def get_local_ip(timeout=0.25):
+    """
+    Resolve this host's IP without letting DNS delay startup.
+
+    gethostbyname can block for seconds on misconfigured resolvers, so
+    run it on a daemon thread and give up after `timeout` — the banner
+    just omits the LAN URL in that case.
+    """
+    result = []
+
+    def resolve():
+        try:
+            result.append(socket.gethostbyname(socket.gethostname()))
+        except OSError:
+            pass
+
+    t = threading.Thread(target=resolve, daemon=True)
+    t.start()
+    t.join(timeout)
+    return result[0] if result else None
+
+
+def dump_json_bytes(data):
+    """Serialize to compact JSON bytes, using orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+class ReusableTCPServer(socketserver.ThreadingMixIn, http.server.HTTPServer):
+    """Threaded server: one request streaming a large video no longer
+    blocks every other connection (the workload is I/O-bound, so threads
+    overlap disk reads and socket writes)."""
+    daemon_threads = True
     allow_reuse_address = True
-    
-    def server_bind(self):
-        self.socket.setsockopt(socketserver.socket.SOL_SOCKET, socketserver.socket.SO_REUSEADDR, 1)
-        super().server_bind()
 
 
 class UnifiedHandler(http.server.SimpleHTTPRequestHandler):
     """Handler that serves hub, civitai, and frameset from one server."""
 
+    # Shared across all requests: a fresh handler instance is built per
+    # connection, so instance-level caches were reset every time and the
+    # caching was a no-op. The lock keeps concurrent first hits from
+    # building the same cache twice.
+    civitai_cache = None
+    frameset_cache = None
+    # Stats are pure functions of the (immutable) item caches, so they
+    # too are computed at most once per process
+    civitai_stats_cache = None
+    frameset_stats_cache = None
+    # Serialized (and gzipped) response bodies per API endpoint: the
+    # caches above never change, so neither do the bytes on the wire
+    _json_body_cache = {}
+    # Known media filenames, filled in while the caches build: lookups
+    # make the 404 path one set probe (no stat calls) and double as a
+    # traversal guard, since only scanned names are ever served
+    civitai_image_names = frozenset()
+    civitai_video_names = frozenset()
+    frameset_image_names = frozenset()
+    _civitai_config_paths = None
+    _cache_lock = threading.Lock()
+
     def __init__(self, *args, **kwargs):
-        self.civitai_cache = None
-        self.frameset_cache = None
         super().__init__(*args, directory=str(SCRIPT_DIR), **kwargs)
 
+    def setup(self):
+        # TCP_NODELAY stops Nagle from delaying small header writes;
+        # the bigger send buffer lets sendfile push more bytes per
+        # syscall on large media transfers
+        try:
+            self.request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            self.request.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, 1 << 20)
+        except OSError:
+            pass
+        super().setup()
+
     def do_GET(self):
         path = urlparse(self.path).path
         
         # === CIVITAI API ENDPOINTS ===
         if path == '/civitai/api/items':
-            self.send_json(self.get_civitai_items())
+            self.send_cached_json('civitai_items', self.get_civitai_items)
             return
-        
+
         if path == '/civitai/api/stats':
-            self.send_json(self.get_civitai_stats())
+            self.send_cached_json('civitai_stats', self.get_civitai_stats)
             return
-        
+
         if path == '/civitai/api/configs':
-            self.send_json(self.get_civitai_configs())
+            self.send_cached_json('civitai_configs', self.get_civitai_configs)
             return
-        
+
         if path.startswith('/civitai/api/media/'):
             media_file = unquote(path.split('/civitai/api/media/')[1])
             self.serve_civitai_media(media_file)
             return
-        
+
         # === FRAMESET API ENDPOINTS ===
         if path == '/frameset/api/images':
-            self.send_json(self.get_frameset_images())
+            self.send_cached_json('frameset_images', self.get_frameset_images)
             return
-        
+
         if path == '/frameset/api/stats':
-            self.send_json(self.get_frameset_stats())
+            self.send_cached_json('frameset_stats', self.get_frameset_stats)
             return
         
         if path.startswith('/frameset/api/image/'):
@@ -89,142 +255,269 @@ class UnifiedHandler(http.server.SimpleHTTPRequestHandler):
 
     # ==================== CIVITAI METHODS ====================
     
-    def get_civitai_items(self):
-        if self.civitai_cache is not None:
-            return self.civitai_cache
-        
-        items = []
+    @classmethod
+    def get_civitai_items(cls):
+        if cls.civitai_cache is not None:
+            return cls.civitai_cache
+
+        with cls._cache_lock:
+            if cls.civitai_cache is not None:
+                return cls.civitai_cache
+            return cls._build_civitai_cache()
+
+    @staticmethod
+    def _index_media_dir(directory):
+        """Map item id -> filename for civitai_<id>.* files in a directory.
+
+        One scandir pass replaces a glob of the whole directory per item:
+        N metadata files against an M-file directory was O(N*M) fnmatch
+        calls, the index makes each lookup a dict hit."""
+        index = {}
+        if not directory.exists():
+            return index
+        with os.scandir(directory) as it:
+            for entry in it:
+                stem = entry.name.split('.', 1)[0]
+                if stem.startswith('civitai_'):
+                    index.setdefault(stem[8:], entry.name)
+        return index
+
+    @classmethod
+    def _index_civitai(cls):
+        """Scan the civitai tree once, building every index at the same time.
+
+        The metadata list, media-id maps and config list used to come
+        from independent glob traversals of overlapping directories;
+        this reads each directory exactly once and hands the results to
+        all of their consumers."""
         civitai_dir = SCRIPT_DIR / 'civitai'
         metadata_dir = civitai_dir / 'metadata'
-        images_dir = civitai_dir / 'images'
-        videos_dir = civitai_dir / 'videos'
-        
+
+        config_paths = []
+        if civitai_dir.exists():
+            with os.scandir(civitai_dir) as it:
+                config_paths = [Path(e.path) for e in it
+                                if e.is_file() and e.name.endswith('.json')]
+
+        # Metadata comes in two forms: legacy one-file-per-item
+        # civitai_<id>.json, and the *_metadata.jsonl shards the scraper
+        # appends to now
+        meta_paths = []
+        shard_paths = []
         if metadata_dir.exists():
-            for json_file in metadata_dir.glob('civitai_*.json'):
+            with os.scandir(metadata_dir) as it:
+                for e in it:
+                    if not e.is_file():
+                        continue
+                    if e.name.startswith('civitai_') and e.name.endswith('.json'):
+                        meta_paths.append(Path(e.path))
+                    elif e.name.endswith('_metadata.jsonl'):
+                        shard_paths.append(Path(e.path))
+
+        img_index = cls._index_media_dir(CIVITAI_IMAGES_DIR)
+        vid_index = cls._index_media_dir(CIVITAI_VIDEOS_DIR)
+        return meta_paths, shard_paths, img_index, vid_index, config_paths
+
+    @classmethod
+    def _build_civitai_cache(cls):
+        items = []
+        images_count = videos_count = total_votes = 0
+
+        meta_paths, shard_paths, img_index, vid_index, config_paths = cls._index_civitai()
+        cls.civitai_image_names = frozenset(img_index.values())
+        cls.civitai_video_names = frozenset(vid_index.values())
+        cls._civitai_config_paths = config_paths
+
+        if meta_paths or shard_paths:
+            def resolve_media(data):
+                # Look up media file in the prebuilt indexes
+                item_id = str(data.get('id'))
+                image_file = img_index.get(item_id)
+                video_file = vid_index.get(item_id)
+
+                if image_file:
+                    data['media_type'] = 'image'
+                    data['media_file'] = image_file
+                elif video_file:
+                    data['media_type'] = 'video'
+                    data['media_file'] = video_file
+                else:
+                    return None
+
+                return data
+
+            def load_one(json_file):
                 try:
-                    with open(json_file, 'r', encoding='utf-8') as f:
-                        data = json.load(f)
-                        item_id = data.get('id')
-                        
-                        # Find media file
-                        image_files = list(images_dir.glob(f'civitai_{item_id}.*'))
-                        video_files = list(videos_dir.glob(f'civitai_{item_id}.*'))
-                        
-                        if image_files:
-                            data['media_type'] = 'image'
-                            data['media_file'] = image_files[0].name
-                        elif video_files:
-                            data['media_type'] = 'video'
-                            data['media_file'] = video_files[0].name
-                        else:
-                            continue
-                        
-                        items.append(data)
+                    # Hand the raw bytes straight to the parser: no
+                    # text-mode handle, no incremental UTF-8 decode
+                    return resolve_media(_loads(json_file.read_bytes()))
                 except Exception as e:
                     print(f"Error loading {json_file}: {e}")
-        
-        self.civitai_cache = items
-        print(f"✓ Loaded {len(items)} Civitai items")
-        return items
+                    return None
 
-    def get_civitai_stats(self):
-        items = self.get_civitai_items()
-        configs = self.get_civitai_configs()
-        
-        if not items:
-            return {"total": 0, "images": 0, "videos": 0, "avg_votes": 0, "total_votes": 0, "configs": len(configs)}
+            def iter_loaded():
+                # Each legacy per-item file is an independent read+parse,
+                # so fan them out; map preserves input order
+                with ThreadPoolExecutor(max_workers=16) as executor:
+                    yield from executor.map(load_one, meta_paths)
+
+                # Newer scrapes append one JSON line per item to the
+                # shard files instead of writing a file per item
+                for shard in shard_paths:
+                    try:
+                        with open(shard, 'rb') as f:
+                            for line in f:
+                                if not line.strip():
+                                    continue
+                                try:
+                                    yield resolve_media(_loads(line))
+                                except Exception as e:
+                                    print(f"Error parsing line in {shard}: {e}")
+                    except OSError as e:
+                        print(f"Error loading {shard}: {e}")
+
+            # Stats accumulate in the same pass that collects the items,
+            # so the aggregates never need another traversal. Items seen
+            # in both a per-item file and a shard count once.
+            seen_ids = set()
+            for data in iter_loaded():
+                if data is None:
+                    continue
+                item_id = str(data.get('id'))
+                if item_id in seen_ids:
+                    continue
+                seen_ids.add(item_id)
+                items.append(data)
+                if data['media_type'] == 'image':
+                    images_count += 1
+                else:
+                    videos_count += 1
+                stats = data.get('stats', {})
+                total_votes += (stats.get('likeCount', 0) + stats.get('heartCount', 0) +
+                                stats.get('laughCount', 0) + stats.get('cryCount', 0))
         
         total = len(items)
-        images = sum(1 for item in items if item.get('media_type') == 'image')
-        videos = total - images
-        
-        total_votes = 0
-        for item in items:
-            stats = item.get('stats', {})
-            votes = (stats.get('likeCount', 0) + stats.get('heartCount', 0) +
-                    stats.get('laughCount', 0) + stats.get('cryCount', 0))
-            total_votes += votes
-        
         avg_votes = total_votes / total if total > 0 else 0
-        
-        return {
+        cls.civitai_stats_cache = {
             "total": total,
-            "images": images,
-            "videos": videos,
+            "images": images_count,
+            "videos": videos_count,
             "avg_votes": round(avg_votes, 1),
             "total_votes": total_votes,
-            "configs": len(configs)
+            "configs": len(cls.get_civitai_configs())
         }
 
-    def get_civitai_configs(self):
+        cls.civitai_cache = items
+        print(f"✓ Loaded {len(items)} Civitai items")
+        return items
+
+    @classmethod
+    def get_civitai_stats(cls):
+        # Populated as a by-product of building the items cache
+        if cls.civitai_stats_cache is None:
+            cls.get_civitai_items()
+        return cls.civitai_stats_cache
+
+    @classmethod
+    def get_civitai_configs(cls):
+        # Config paths come from the one-shot civitai index
+        if cls._civitai_config_paths is None:
+            cls.get_civitai_items()
+
         configs = []
-        civitai_dir = SCRIPT_DIR / 'civitai'
-        
-        for json_file in civitai_dir.glob('*.json'):
-            if json_file.parent == civitai_dir / 'metadata':
-                continue
+        for json_file in cls._civitai_config_paths:
             try:
-                with open(json_file, 'r', encoding='utf-8') as f:
-                    config = json.load(f)
-                    config['filename'] = json_file.name
-                    configs.append(config)
+                config = _loads(json_file.read_bytes())
+                config['filename'] = json_file.name
+                configs.append(config)
             except:
                 pass
         return configs
 
     def serve_civitai_media(self, media_file):
-        civitai_dir = SCRIPT_DIR / 'civitai'
-        
-        # Try images first
-        media_path = civitai_dir / 'images' / media_file
-        if not media_path.exists():
-            # Try videos
-            media_path = civitai_dir / 'videos' / media_file
-        
-        if media_path.exists():
-            self.serve_file(media_path)
+        # Set probes replace the exists()/exists() stat pair, and only
+        # filenames seen during the directory scan are ever served
+        self.get_civitai_items()
+
+        if media_file in UnifiedHandler.civitai_image_names:
+            self.serve_file(CIVITAI_IMAGES_DIR / media_file)
+        elif media_file in UnifiedHandler.civitai_video_names:
+            self.serve_file(CIVITAI_VIDEOS_DIR / media_file)
         else:
             self.send_error(404, f"Media not found: {media_file}")
 
     # ==================== FRAMESET METHODS ====================
     
-    def get_frameset_images(self):
-        if self.frameset_cache is not None:
-            return self.frameset_cache
-        
+    @classmethod
+    def get_frameset_images(cls):
+        if cls.frameset_cache is not None:
+            return cls.frameset_cache
+
+        with cls._cache_lock:
+            if cls.frameset_cache is not None:
+                return cls.frameset_cache
+            return cls._build_frameset_cache()
+
+    @classmethod
+    def _build_frameset_cache(cls):
         images = []
-        images_dir = SCRIPT_DIR / 'frameset' / 'images'
-        
+        images_dir = FRAMESET_IMAGES_DIR
+
         if images_dir.exists():
-            extensions = ['*.jpg', '*.jpeg', '*.png', '*.gif', '*.webp', '*.bmp']
-            
-            for ext in extensions:
-                for img_path in images_dir.glob(ext):
-                    try:
-                        with Image.open(img_path) as img:
-                            width, height = img.size
-                        
-                        file_size = img_path.stat().st_size
-                        
-                        images.append({
-                            "filename": img_path.name,
-                            "width": width,
-                            "height": height,
-                            "file_size": file_size,
-                            "format": img_path.suffix[1:].upper()
-                        })
-                    except Exception as e:
-                        print(f"Error loading {img_path.name}: {e}")
-            
+            # One scandir pass instead of a glob traversal per extension;
+            # entry.stat() reuses the data scandir already fetched
+            with os.scandir(images_dir) as it:
+                entries = [e for e in it
+                           if e.is_file()
+                           and os.path.splitext(e.name)[1].lower() in FRAMESET_EXTENSIONS]
+
+            def probe(entry):
+                try:
+                    # Dimensions come from the first header bytes; PIL
+                    # only runs for formats the fast parser doesn't know
+                    dims = _fast_dim(entry.path)
+                    if dims is None:
+                        with Image.open(entry.path) as img:
+                            dims = img.size
+                    width, height = dims
+
+                    return {
+                        "filename": entry.name,
+                        "width": width,
+                        "height": height,
+                        "file_size": entry.stat().st_size,
+                        "format": os.path.splitext(entry.name)[1][1:].upper()
+                    }
+                except Exception as e:
+                    print(f"Error loading {entry.name}: {e}")
+                    return None
+
+            # Header parsing is almost pure I/O, so overlap the per-file
+            # opens instead of paying seek latency serially
+            workers = min(32, (os.cpu_count() or 4) * 4)
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                images = [img for img in executor.map(probe, entries)
+                          if img is not None]
+
             images.sort(key=lambda x: x['filename'])
         
-        self.frameset_cache = images
+        cls.frameset_image_names = frozenset(img['filename'] for img in images)
+        cls.frameset_cache = images
         print(f"✓ Loaded {len(images)} frameset images")
         return images
 
-    def get_frameset_stats(self):
-        images = self.get_frameset_images()
-        
+    @classmethod
+    def get_frameset_stats(cls):
+        if cls.frameset_stats_cache is not None:
+            return cls.frameset_stats_cache
+
+        cls.frameset_stats_cache = cls._compute_frameset_stats()
+        return cls.frameset_stats_cache
+
+    @classmethod
+    def _compute_frameset_stats(cls):
+        images = cls.get_frameset_images()
+
         if not images:
             return {"total": 0, "total_size": 0, "avg_width": 0, "avg_height": 0}
         
@@ -241,10 +534,10 @@ class UnifiedHandler(http.server.SimpleHTTPRequestHandler):
         }
 
     def serve_frameset_image(self, image_file):
-        image_path = SCRIPT_DIR / 'frameset' / 'images' / image_file
-        
-        if image_path.exists():
-            self.serve_file(image_path)
+        self.get_frameset_images()
+
+        if image_file in UnifiedHandler.frameset_image_names:
+            self.serve_file(FRAMESET_IMAGES_DIR / image_file)
         else:
             self.send_error(404, f"Image not found: {image_file}")
 
@@ -253,29 +546,152 @@ class UnifiedHandler(http.server.SimpleHTTPRequestHandler):
     def serve_file(self, file_path):
         """Serve a file with proper headers."""
         try:
-            content_type, _ = mimetypes.guess_type(str(file_path))
-            if not content_type:
-                content_type = 'application/octet-stream'
-            
+            content_type = _ct_for_suffix(file_path.suffix.lower())
+
             with open(file_path, 'rb') as f:
-                data = f.read()
-            
-            self.send_response(200)
-            self.send_header('Content-Type', content_type)
-            self.send_header('Content-Length', len(data))
-            self.send_header('Cache-Control', 'public, max-age=86400')
-            self.end_headers()
-            self.wfile.write(data)
+                st = os.fstat(f.fileno())
+                size = st.st_size
+
+                # Weak validator from size+mtime: no hashing, yet it
+                # changes whenever the file does. After max-age expires
+                # the browser revalidates with a zero-body 304 instead
+                # of redownloading.
+                etag = f'W/"{st.st_size:x}-{st.st_mtime_ns:x}"'
+                last_modified = self.date_time_string(st.st_mtime)
+
+                # HTML5 video seeks with Range requests; without 206
+                # support the browser redownloads whole files
+                range_match = None
+                range_header = self.headers.get('Range')
+                if range_header:
+                    range_match = _RANGE_RE.match(range_header.strip())
+                elif self._not_modified(etag, st.st_mtime):
+                    self.send_response(304)
+                    self.send_header('ETag', etag)
+                    self.send_header('Cache-Control', 'public, max-age=86400')
+                    self.end_headers()
+                    return
+
+                if range_match:
+                    start = int(range_match.group(1))
+                    end = int(range_match.group(2)) if range_match.group(2) else size - 1
+                    end = min(end, size - 1)
+                    if start > end or start >= size:
+                        self.send_response(416)
+                        self.send_header('Content-Range', f'bytes */{size}')
+                        self.end_headers()
+                        return
+
+                    length = end - start + 1
+                    self.send_response(206)
+                    self.send_header('Content-Type', content_type)
+                    self.send_header('Content-Length', length)
+                    self.send_header('Content-Range', f'bytes {start}-{end}/{size}')
+                    self.send_header('Accept-Ranges', 'bytes')
+                    self.send_header('ETag', etag)
+                    self.send_header('Last-Modified', last_modified)
+                    self.send_header('Cache-Control', 'public, max-age=86400')
+                    self.end_headers()
+
+                    self._send_file_body(f, length, offset=start)
+                    return
+
+                self.send_response(200)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', size)
+                self.send_header('Accept-Ranges', 'bytes')
+                self.send_header('ETag', etag)
+                self.send_header('Last-Modified', last_modified)
+                self.send_header('Cache-Control', 'public, max-age=86400')
+                self.end_headers()
+
+                self._send_file_body(f, size)
         except Exception as e:
             print(f"Error serving {file_path}: {e}")
             self.send_error(500, str(e))
 
-    def send_json(self, data):
-        """Send JSON response."""
+    def _not_modified(self, etag, mtime):
+        """True when the client's validators show its copy is current."""
+        if self.headers.get('If-None-Match') == etag:
+            return True
+
+        ims = self.headers.get('If-Modified-Since')
+        if ims:
+            try:
+                return int(mtime) <= parsedate_to_datetime(ims).timestamp()
+            except (TypeError, ValueError):
+                pass
+        return False
+
+    def _send_file_body(self, f, size, offset=0):
+        """Copy `size` bytes of an open file to the client.
+
+        Prefers os.sendfile — the kernel moves pages straight from page
+        cache to the socket, never materializing the file in userspace
+        (a 50MB video used to mean a 50MB Python bytes object plus two
+        copies). Falls back to chunked copyfileobj where sendfile isn't
+        available for the socket."""
+        self.wfile.flush()
+        sent = 0
+        try:
+            out_fd = self.wfile.fileno()
+            while sent < size:
+                n = os.sendfile(out_fd, f.fileno(), offset + sent, size - sent)
+                if n == 0:
+                    break
+                sent += n
+        except (AttributeError, OSError) as e:
+            if sent:
+                # Partial sendfile progress: restarting from offset would
+                # resend delivered bytes and overrun Content-Length, so
+                # drop the connection and let the short body surface it
+                print(f"sendfile aborted after {sent}/{size} bytes: {e}")
+                self.close_connection = True
+                return
+            f.seek(offset)
+            remaining = size
+            while remaining > 0:
+                chunk = f.read(min(1 << 16, remaining))
+                if not chunk:
+                    break
+                self.wfile.write(chunk)
+                remaining -= len(chunk)
+
+    @classmethod
+    def _cached_json_payload(cls, name, getter):
+        """Serialize and compress an endpoint's payload at most once."""
+        entry = cls._json_body_cache.get(name)
+        if entry is None:
+            body = dump_json_bytes(getter())
+            # Level 1 compresses JSON ~3x while staying several times
+            # faster than the default level
+            entry = (body, gzip.compress(body, compresslevel=1))
+            cls._json_body_cache[name] = entry
+        return entry
+
+    def send_cached_json(self, name, getter):
+        """Send a JSON response from the per-endpoint payload cache.
+
+        Repeat hits skip serialization and compression entirely — the
+        underlying caches never change, so neither do these bytes."""
+        body, body_gz = self._cached_json_payload(name, getter)
         self.send_response(200)
         self.send_header('Content-Type', 'application/json')
+        if 'gzip' in self.headers.get('Accept-Encoding', ''):
+            body = body_gz
+            self.send_header('Content-Encoding', 'gzip')
+        self.send_header('Content-Length', len(body))
         self.end_headers()
-        self.wfile.write(json.dumps(data, ensure_ascii=False, indent=2).encode('utf-8'))
+        self._write_chunked(body)
+
+    def _write_chunked(self, body, chunk=1 << 16):
+        """Write a large body in 64KB slices through a memoryview.
+
+        TCP starts draining after the first slice instead of waiting on
+        one monolithic write, and the slices don't copy the buffer."""
+        mv = memoryview(body)
+        for i in range(0, len(body), chunk):
+            self.wfile.write(mv[i:i + chunk])
 
     def log_message(self, format, *args):
         """Minimal logging."""
@@ -302,6 +718,12 @@ def main():
     
     # Create server
     httpd = ReusableTCPServer((args.host, args.port), UnifiedHandler)
+
+    # Warm every cache before accepting connections: startup pays for
+    # the JSON parses and image probes once, the first visitor doesn't
+    print("\n🔥 Warming caches...")
+    UnifiedHandler.get_civitai_stats()
+    UnifiedHandler.get_frameset_stats()
     
     # Signal handler
     shutdown_flag = {'triggered': False}
@@ -321,12 +743,9 @@ def main():
     print("=" * 60)
     print(f"🌐 Server: http://{args.host}:{args.port}")
     if args.host == "0.0.0.0":
-        import socket
-        try:
-            local_ip = socket.gethostbyname(socket.gethostname())
+        local_ip = get_local_ip()
+        if local_ip:
             print(f"🔗 Local:  http://{local_ip}:{args.port}")
-        except:
-            pass
         print(f"🔗 Localhost: http://localhost:{args.port}")
     print("=" * 60)
     print("\n📍 Available at:")